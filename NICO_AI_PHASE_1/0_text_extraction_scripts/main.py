@@ -14,108 +14,165 @@ Author: NICO AI
 Date: 2025-11-29
 """
 
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from ncert_extractor import extract_ncert_content
-import sys
+
+
+def _list_pdfs(directory):
+    """
+    List the PDF files in a directory, sorted by name.
+
+    Uses os.scandir, which returns entries with cached stat info in a
+    single pass instead of materializing Path objects via glob.
+    """
+    return sorted(
+        Path(entry.path) for entry in os.scandir(directory)
+        if entry.is_file() and entry.name.lower().endswith('.pdf')
+    )
+
+
+def _get_executor():
+    """
+    Pick the executor class for the batch pool.
+
+    On free-threaded CPython builds (PEP 703, python -X gil=0 /
+    --disable-gil) threads run CPU-bound extraction concurrently, so a
+    ThreadPoolExecutor avoids the per-process memory overhead and task
+    pickling of a process pool. With the GIL enabled, processes remain
+    the only way to get real parallelism.
+    """
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    return ThreadPoolExecutor if gil_enabled is False else ProcessPoolExecutor
+
+
+def _extract_one(args):
+    """
+    Extract a single PDF. Runs in a worker process.
+
+    Args:
+        args: Tuple of (pdf_path_str, lang, output_path_str)
+
+    Returns:
+        Tuple of (pdf_path_str, error) where error is None on success
+        or the exception that was raised.
+    """
+    pdf_path_str, lang, output_path_str = args
+
+    try:
+        extract_ncert_content(
+            pdf_path=pdf_path_str,
+            lang=lang,
+            output_path=output_path_str
+        )
+        return (pdf_path_str, None)
+    except Exception as e:
+        # Return the failure instead of raising so one bad PDF
+        # doesn't take down the whole pool
+        return (pdf_path_str, e)
 
 
 def main():
     """
     Batch process all NCERT PDFs in the pdfs/ directory.
-    
+
+    PDFs are extracted in parallel across processes (each extraction is
+    CPU-bound and fully independent).
+
     Directory structure:
         pdfs/
         ├── science-en/  (English PDFs)
         └── science-hi/  (Hindi PDFs)
-    
+
     Output structure:
         outputs/
         ├── science-en/  (English text files)
         └── science-hi/  (Hindi text files)
     """
-    
+
     # Define base directories
     base_dir = Path(__file__).parent
     pdfs_dir = base_dir / "pdfs"
     outputs_dir = base_dir / "outputs"
-    
+
     # Create output directories
     outputs_dir.mkdir(exist_ok=True)
     (outputs_dir / "science-en").mkdir(exist_ok=True)
     (outputs_dir / "science-hi").mkdir(exist_ok=True)
-    
+
     print("=" * 70)
     print("NCERT BATCH PDF EXTRACTOR")
     print("=" * 70)
     print(f"\nInput directory:  {pdfs_dir}")
     print(f"Output directory: {outputs_dir}\n")
-    
-    # Process English PDFs
+
+    # Collect extraction tasks for both languages
+    tasks = []
+
     english_pdfs_dir = pdfs_dir / "science-en"
     english_output_dir = outputs_dir / "science-en"
-    
+
     if english_pdfs_dir.exists():
-        english_pdfs = sorted(english_pdfs_dir.glob("*.pdf"))
+        english_pdfs = _list_pdfs(english_pdfs_dir)
         print(f"📚 Found {len(english_pdfs)} English PDFs")
-        print("-" * 70)
-        
-        for idx, pdf_path in enumerate(english_pdfs, 1):
+
+        for pdf_path in english_pdfs:
             output_path = english_output_dir / f"{pdf_path.stem}.txt"
-            
-            print(f"\n[{idx}/{len(english_pdfs)}] Processing: {pdf_path.name}")
-            
-            try:
-                extract_ncert_content(
-                    pdf_path=str(pdf_path),
-                    lang='en',
-                    output_path=str(output_path)
-                )
-            except Exception as e:
-                print(f"❌ ERROR: {e}")
-                continue
+            tasks.append((str(pdf_path), 'en', str(output_path)))
     else:
         print(f"⚠️  English PDFs directory not found: {english_pdfs_dir}")
-    
-    print("\n" + "=" * 70)
-    
-    # Process Hindi PDFs
+
     hindi_pdfs_dir = pdfs_dir / "science-hi"
     hindi_output_dir = outputs_dir / "science-hi"
-    
+
     if hindi_pdfs_dir.exists():
-        hindi_pdfs = sorted(hindi_pdfs_dir.glob("*.pdf"))
+        hindi_pdfs = _list_pdfs(hindi_pdfs_dir)
         print(f"📚 Found {len(hindi_pdfs)} Hindi PDFs")
-        print("-" * 70)
-        
-        for idx, pdf_path in enumerate(hindi_pdfs, 1):
+
+        for pdf_path in hindi_pdfs:
             output_path = hindi_output_dir / f"{pdf_path.stem}.txt"
-            
-            print(f"\n[{idx}/{len(hindi_pdfs)}] Processing: {pdf_path.name}")
-            
-            try:
-                extract_ncert_content(
-                    pdf_path=str(pdf_path),
-                    lang='hi',
-                    output_path=str(output_path)
-                )
-            except Exception as e:
-                print(f"❌ ERROR: {e}")
-                continue
+            tasks.append((str(pdf_path), 'hi', str(output_path)))
     else:
         print(f"⚠️  Hindi PDFs directory not found: {hindi_pdfs_dir}")
-    
+
+    print("-" * 70)
+
+    # Extract PDFs in parallel (each task is CPU-bound and independent)
+    num_workers = min(os.cpu_count() or 1, 4)
+    print(f"⚙️  Extracting {len(tasks)} PDFs with {num_workers} workers\n")
+
+    failed = []
+
+    if tasks:
+        executor_cls = _get_executor()
+        with executor_cls(max_workers=num_workers) as executor:
+            futures = {executor.submit(_extract_one, task): task for task in tasks}
+
+            for idx, future in enumerate(as_completed(futures), 1):
+                pdf_path_str, error = future.result()
+
+                if error is None:
+                    print(f"[{idx}/{len(tasks)}] ✓ {Path(pdf_path_str).name}")
+                else:
+                    print(f"[{idx}/{len(tasks)}] ❌ {Path(pdf_path_str).name}: {error}")
+                    failed.append(pdf_path_str)
+
     # Summary
     print("\n" + "=" * 70)
     print("✅ BATCH EXTRACTION COMPLETE!")
     print("=" * 70)
-    
+
     # Count output files
     en_outputs = list(english_output_dir.glob("*.txt"))
     hi_outputs = list(hindi_output_dir.glob("*.txt"))
-    
+
     print(f"\n📊 Summary:")
     print(f"   English texts: {len(en_outputs)} files in {english_output_dir}")
     print(f"   Hindi texts:   {len(hi_outputs)} files in {hindi_output_dir}")
+    if failed:
+        print(f"   Failed:        {len(failed)} PDFs")
     print(f"\n   Total:         {len(en_outputs) + len(hi_outputs)} text files extracted")
     print("\n" + "=" * 70)
     print("🎯 Next step: Sentence alignment")
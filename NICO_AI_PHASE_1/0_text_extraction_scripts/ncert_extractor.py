@@ -10,12 +10,13 @@ Installation Instructions:
 --------------------------
 Install the required Python libraries using pip:
 
-    pip install PyMuPDF pdfplumber indic-nlp-library typing
+    pip install PyMuPDF indic-nlp-library tqdm typing
 
 Required Libraries:
-- PyMuPDF (fitz): Fast, reliable text extraction and structural analysis
-- pdfplumber: Robust table detection and extraction
+- PyMuPDF (fitz): Fast, reliable text extraction, table detection and
+  structural analysis
 - indic-nlp-library: Script-specific normalization for Hindi (Devanagari)
+- tqdm: Throttled progress reporting
 - typing: Type hinting support
 
 Author: NICO AI
@@ -23,11 +24,14 @@ Date: 2025-11-29
 """
 
 import fitz  # PyMuPDF
-import pdfplumber
 import re
+import sys
+from functools import lru_cache
 from typing import List, Tuple
 from pathlib import Path
 
+from tqdm import tqdm
+
 # Indic NLP imports
 try:
     from indicnlp.normalize.indic_normalize import IndicNormalizerFactory
@@ -38,6 +42,18 @@ except ImportError:
     print("Warning: indic-nlp-library not available. Hindi normalization will be limited.")
 
 
+# Pre-compiled patterns for general_cleaner; it runs once per page, so
+# compiling here avoids re.cache lookups on every call
+_HYPHEN_JOIN = re.compile(r'(\w+)-\s*\n\s*(\w+)')
+_CHAP = re.compile(r'^(Chapter|CHAPTER)\s+\d+')
+_SUBJ = re.compile(r'^(Science|SCIENCE|Mathematics|MATHEMATICS|Biology|BIOLOGY)')
+_WS = re.compile(r'\n{3,}| {2,}')
+
+# Single-pass character fixes for Hindi text: pipe -> poorna virama (।),
+# ZWJ (U+200D) and ZWNJ (U+200C) stripped
+_INDIC_TABLE = str.maketrans({'|': '।', '\u200D': None, '\u200C': None})
+
+
 def general_cleaner(text: str) -> str:
     """
     Clean and normalize general text extracted from PDFs.
@@ -58,43 +74,49 @@ def general_cleaner(text: str) -> str:
     
     # Remove soft hyphens and line-ending hyphens
     # Pattern: word- \n word becomes wordword
-    text = re.sub(r'(\w+)-\s*\n\s*(\w+)', r'\1\2', text)
-    
-    # Remove common PDF artifacts and boilerplate
-    lines = text.split('\n')
-    cleaned_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        
-        # Skip empty lines (will be consolidated later)
-        if not line:
-            continue
-            
-        # Skip lines that are only page numbers
-        if re.match(r'^\d+$', line):
-            continue
-            
-        # Skip common NCERT headers/footers patterns
-        if re.match(r'^(Chapter|CHAPTER)\s+\d+', line):
-            continue
-        if re.match(r'^(Science|SCIENCE|Mathematics|MATHEMATICS|Biology|BIOLOGY)', line) and len(line) < 30:
-            continue
-            
-        cleaned_lines.append(line)
-    
-    # Join lines and consolidate whitespace
-    text = '\n'.join(cleaned_lines)
+    text = _HYPHEN_JOIN.sub(r'\1\2', text)
     
-    # Consolidate multiple newlines into double newlines (paragraph breaks)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    # Drop empty lines, page-number-only lines and common NCERT
+    # header/footer lines in a single pass; str.isdigit replaces the
+    # page-number regex and the C-level str.join does the concatenation
+    text = '\n'.join(
+        line for line in map(str.strip, text.split('\n'))
+        if line
+        and not line.isdigit()
+        and not _CHAP.match(line)
+        and not (_SUBJ.match(line) and len(line) < 30)
+    )
     
-    # Consolidate multiple spaces
-    text = re.sub(r' {2,}', ' ', text)
+    # Consolidate runs of newlines into paragraph breaks and runs of
+    # spaces into one space, in a single pass over the text
+    text = _WS.sub(lambda m: '\n\n' if m.group(0)[0] == '\n' else ' ', text)
     
     return text.strip()
 
 
+@lru_cache(maxsize=8)
+def _get_normalizer(lang: str):
+    """
+    Build and cache the Indic normalizer for a language.
+
+    Factory construction allocates lookup tables that are expensive
+    relative to normalizing a single page, so the normalizer is built
+    once per language rather than once per call.
+
+    Returns:
+        The normalizer, or None if indic-nlp-library is unavailable
+        or the language is unsupported.
+    """
+    if not INDIC_NLP_AVAILABLE:
+        return None
+
+    try:
+        return IndicNormalizerFactory().get_normalizer(lang)
+    except Exception as e:
+        print(f"Warning: could not build Indic normalizer for '{lang}': {e}")
+        return None
+
+
 def indic_normalize(text: str, lang: str) -> str:
     """
     Normalize Indic language text (specifically Hindi/Devanagari).
@@ -114,38 +136,30 @@ def indic_normalize(text: str, lang: str) -> str:
     if lang != 'hi' or not text:
         return text
     
-    # Replace pipe character with Hindi poorna virama (।)
-    text = text.replace('|', '।')
+    # Pipe -> poorna virama plus ZWJ/ZWNJ removal in one C-level pass
+    text = text.translate(_INDIC_TABLE)
     
-    if INDIC_NLP_AVAILABLE:
+    normalizer = _get_normalizer(lang)
+    if normalizer is not None:
         try:
-            # Initialize the normalizer factory for Hindi
-            factory = IndicNormalizerFactory()
-            normalizer = factory.get_normalizer(lang)
-            
             # Perform normalization
             # This handles ZWJ/ZWNJ removal and Nukta canonicalization
             text = normalizer.normalize(text)
             
         except Exception as e:
             print(f"Warning: Indic normalization failed: {e}")
-            # Fall back to basic normalization
+            # Fall back to the translate pass already applied above
             pass
     
-    # Manual fallback for basic normalization if library not available
-    # Remove Zero Width Joiner (U+200D) and Zero Width Non-Joiner (U+200C)
-    text = text.replace('\u200D', '')  # ZWJ
-    text = text.replace('\u200C', '')  # ZWNJ
-    
     return text
 
 
 def extract_tables_from_page(page) -> List[Tuple[str, int]]:
     """
-    Extract tables from a pdfplumber page and convert to Markdown format.
+    Extract tables from a PyMuPDF page and convert to Markdown format.
     
     Args:
-        page: pdfplumber page object
+        page: fitz.Page object
         
     Returns:
         List of tuples (markdown_table, approximate_y_position)
@@ -153,7 +167,7 @@ def extract_tables_from_page(page) -> List[Tuple[str, int]]:
     tables_data = []
     
     try:
-        tables = page.find_tables()
+        tables = page.find_tables().tables
         
         for table in tables:
             # Extract table data
@@ -162,28 +176,16 @@ def extract_tables_from_page(page) -> List[Tuple[str, int]]:
             if not table_data:
                 continue
             
-            # Convert to Markdown format
-            markdown_lines = []
-            markdown_lines.append("[TABLE START]")
-            
-            # Add header row
-            if len(table_data) > 0:
-                header = table_data[0]
-                # Clean None values
-                header = [str(cell).strip() if cell else "" for cell in header]
-                markdown_lines.append("| " + " | ".join(header) + " |")
-                
-                # Add separator
-                markdown_lines.append("| " + " | ".join(["---"] * len(header)) + " |")
-                
-                # Add data rows
-                for row in table_data[1:]:
-                    row = [str(cell).strip() if cell else "" for cell in row]
-                    markdown_lines.append("| " + " | ".join(row) + " |")
+            # Clean every cell up front, then emit header, separator and
+            # body rows as Markdown with a single join
+            rows = [["" if cell is None else str(cell).strip() for cell in row]
+                    for row in table_data]
+            header = rows[0]
+            separator = ["---"] * len(header)
+            row_lines = ["| " + " | ".join(row) + " |"
+                         for row in (header, separator, *rows[1:])]
             
-            markdown_lines.append("[TABLE END]")
-            
-            markdown_table = "\n".join(markdown_lines)
+            markdown_table = "[TABLE START]\n" + "\n".join(row_lines) + "\n[TABLE END]"
             
             # Get approximate Y position for ordering
             y_position = table.bbox[1] if hasattr(table, 'bbox') else 0
@@ -196,16 +198,129 @@ def extract_tables_from_page(page) -> List[Tuple[str, int]]:
     return tables_data
 
 
+def _finalize_page(text: str, lang: str) -> List[str]:
+    """
+    Clean, normalize and paragraph-split one page's text in a single
+    fused pipeline.
+
+    Runs general_cleaner, Indic normalization and the write-time
+    paragraph split back to back on the same string, so each page is
+    materialized once per stage instead of being rebuilt by separate
+    cleaner / normalizer / writer passes.
+
+    Args:
+        text: Merged raw text for one run of text blocks (no tables)
+        lang: Language code ('en' for English, 'hi' for Hindi)
+
+    Returns:
+        Output lines ready for writelines (one paragraph per line,
+        each ending with a newline)
+    """
+    if not text:
+        return []
+
+    # general_cleaner is already a fused single pass over the text
+    text = general_cleaner(text)
+
+    # Normalize the whole page at once rather than paragraph by paragraph
+    if lang == 'hi':
+        text = indic_normalize(text, lang)
+
+    # Split into paragraphs and emit one line per paragraph; table
+    # blocks never pass through here, so internal newlines can be
+    # flattened without scanning for the [TABLE START] marker
+    lines = []
+    for para in text.split('\n\n'):
+        para = para.strip()
+        if para:
+            lines.append(para.replace('\n', ' ') + '\n')
+
+    return lines
+
+
+def _process_page(fitz_page, lang: str) -> List[str]:
+    """
+    Extract and clean a single page.
+
+    Args:
+        fitz_page: fitz.Page object to process
+        lang: Language code ('en' for English, 'hi' for Hindi)
+
+    Returns:
+        Cleaned output lines for the page, ready for writelines
+        (empty for blank or image-only pages)
+    """
+    # Parse the page's content stream once into a TextPage and run all
+    # text queries against it, rather than re-tokenizing per get_text call
+    textpage = fitz_page.get_textpage()
+
+    # Extract text as positioned blocks: (x0, y0, x1, y1, text, no, type)
+    blocks = textpage.extractBLOCKS()
+
+    # Scanned/image-only pages carry no usable text but would still pay
+    # the full line/rect analysis in find_tables; detect them early
+    text_len = sum(len(b[4].strip()) for b in blocks if b[6] == 0)
+    if text_len < 20 and fitz_page.get_images(full=False):
+        tables = []
+    else:
+        # Extract tables with positions
+        tables = extract_tables_from_page(fitz_page)
+
+    # Blank or image-only pages carry nothing worth cleaning
+    if not blocks and not tables:
+        return []
+
+    # Merge text blocks and table Markdown by vertical position so
+    # tables land where they appear in the reading flow. Each piece is
+    # tagged as table or text at construction, so nothing downstream has
+    # to rescan paragraphs for the [TABLE START] marker
+    pieces = [(b[1], b[4], False) for b in blocks if b[6] == 0 and b[4].strip()]
+    pieces.extend((y_position, table_md, True) for table_md, y_position in tables)
+
+    if not pieces:
+        return []
+
+    pieces.sort(key=lambda piece: piece[0])
+
+    # Free the parsed content model before the string-heavy cleaning
+    del textpage
+
+    # Clean and paragraph-split each run of text between tables; table
+    # Markdown passes through untouched apart from Indic normalization
+    lines = []
+    text_run = []
+
+    for _, piece_text, is_table in pieces:
+        if is_table:
+            if text_run:
+                lines.extend(_finalize_page("\n\n".join(text_run), lang))
+                text_run = []
+            if lang == 'hi':
+                piece_text = indic_normalize(piece_text, lang)
+            lines.append(piece_text + '\n')
+        else:
+            text_run.append(piece_text)
+
+    if text_run:
+        lines.extend(_finalize_page("\n\n".join(text_run), lang))
+
+    return lines
+
+
 def extract_ncert_content(pdf_path: str, lang: str, output_path: str) -> None:
     """
     Extract content from NCERT PDF with table handling and text normalization.
     
     This is the main extraction function that:
-    1. Detects and extracts tables using pdfplumber
+    1. Detects and extracts tables using PyMuPDF's find_tables
     2. Extracts general text using PyMuPDF
     3. Integrates tables into the reading flow
     4. Applies cleaning and normalization
-    
+
+    Parallelism lives at file granularity in main.py (one PDF per worker
+    process), so this function opens the document exactly once and walks
+    its pages sequentially.
+
     Args:
         pdf_path: Path to the input PDF file
         lang: Language code ('en' for English, 'hi' for Hindi)
@@ -214,74 +329,43 @@ def extract_ncert_content(pdf_path: str, lang: str, output_path: str) -> None:
     print(f"Processing: {pdf_path}")
     print(f"Language: {lang}")
     print(f"Output: {output_path}")
-    
-    all_content = []
-    
+
+    pdf_fitz = None
+
     try:
-        # Open PDF with both libraries
+        # Open the document once; pages are read from the same handle.
+        # Opening by path lets PyMuPDF do its own incremental I/O (its
+        # stream= parameter only takes bytes-like objects, so an mmap
+        # could not be handed over without copying the whole file)
         pdf_fitz = fitz.open(pdf_path)
-        pdf_plumber = pdfplumber.open(pdf_path)
-        
         total_pages = len(pdf_fitz)
+
         print(f"Total pages: {total_pages}")
+
+        # Stream each page straight to disk as it is produced, so peak
+        # memory stays at roughly one page instead of the whole book
+        # tqdm throttles its own redraws, unlike the previous per-page
+        # carriage-return print which hit stdout once per page
+        page_iter = tqdm(range(total_pages), desc=Path(pdf_path).name,
+                         unit='pg', disable=not sys.stderr.isatty())
+
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for page_num in page_iter:
+                # One paragraph per line, batched per page
+                page_lines = _process_page(pdf_fitz[page_num], lang)
+                if page_lines:
+                    f.writelines(page_lines)
         
-        for page_num in range(total_pages):
-            print(f"Processing page {page_num + 1}/{total_pages}...", end='\r')
-            
-            # Get pages from both libraries
-            fitz_page = pdf_fitz[page_num]
-            plumber_page = pdf_plumber.pages[page_num]
-            
-            # Extract tables with positions
-            tables = extract_tables_from_page(plumber_page)
-            
-            # Extract text using PyMuPDF (preserves reading order better)
-            text = fitz_page.get_text("text")
-            
-            # If tables were found, we need to integrate them
-            if tables:
-                # For simplicity, append tables at the end of page content
-                # A more sophisticated approach would use coordinates to insert them
-                page_content = text
-                for table_md, _ in tables:
-                    page_content += "\n\n" + table_md + "\n\n"
-            else:
-                page_content = text
-            
-            # Apply general cleaning
-            page_content = general_cleaner(page_content)
-            
-            # Apply Indic normalization if Hindi
-            if lang == 'hi':
-                page_content = indic_normalize(page_content, lang)
-            
-            if page_content:
-                all_content.append(page_content)
-        
-        # Close PDFs
-        pdf_fitz.close()
-        pdf_plumber.close()
-        
-        print(f"\nExtraction complete. Writing to {output_path}...")
-        
-        # Write output with one paragraph per line
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for page_content in all_content:
-                # Split by paragraph breaks
-                paragraphs = page_content.split('\n\n')
-                for para in paragraphs:
-                    para = para.strip()
-                    if para:
-                        # Replace internal newlines with spaces (except for tables)
-                        if '[TABLE START]' not in para:
-                            para = para.replace('\n', ' ')
-                        f.write(para + '\n')
+        print(f"\nExtraction complete.")
         
         print(f"✓ Successfully extracted content to {output_path}")
         
     except Exception as e:
         print(f"\n✗ Error processing {pdf_path}: {e}")
         raise
+    finally:
+        if pdf_fitz is not None:
+            pdf_fitz.close()
 
 
 if __name__ == "__main__":